@@ -5,13 +5,20 @@ Datasets are cached locally and provided in standardized formats.
 """
 import os
 import hashlib
+import functools
 import json
+import mmap
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Union, Any, Callable
 from tqdm import tqdm
-import logging
 
 # Base paths
 DATA_DIR = Path(__file__).parents[1] / "data"
@@ -19,6 +26,23 @@ RAW_DIR = DATA_DIR / "raw"
 PROCESSED_DIR = DATA_DIR / "processed"
 METADATA_FILE = DATA_DIR / "metadata.json"
 
+# Download tuning
+STREAM_CHUNK_SIZE = 1 << 20
+RANGE_CHUNK_SIZE = 4 << 20
+DOWNLOAD_WORKERS = 4
+
+
+# Ranged downloads need the raw bytes, so ask servers not to compress them
+_IDENTITY = {'Accept-Encoding': 'identity'}
+
+# Shared HTTP session so connections and TLS handshakes are reused across
+# range requests and downloads
+_SESSION = requests.Session()
+for _prefix in ('http://', 'https://'):
+    _SESSION.mount(_prefix, HTTPAdapter(
+        pool_connections=DOWNLOAD_WORKERS, pool_maxsize=DOWNLOAD_WORKERS
+    ))
+
 def _process_framingham_mini(df: pd.DataFrame) -> pd.DataFrame:
     """Process Framingham mini dataset."""
     # Rename columns for clarity
@@ -44,26 +68,49 @@ def _process_framingham_mini(df: pd.DataFrame) -> pd.DataFrame:
     # Convert binary columns to boolean
     binary_cols = ['is_current_smoker', 'on_bp_meds', 'had_stroke', 
                   'has_hypertension', 'has_diabetes', 'chd_10year']
-    for col in binary_cols:
-        df[col] = df[col].astype(bool)
+    df = df.astype({col: 'bool[pyarrow]' for col in binary_cols})
     
     return df
 
 def _process_covid_counties(df: pd.DataFrame) -> pd.DataFrame:
     """Process COVID-19 counties dataset."""
-    # Convert date to datetime
-    df['date'] = pd.to_datetime(df['date'])
+    # Convert date to datetime; the NYT data is always ISO formatted, so an
+    # explicit format skips per-row format inference
+    df['date'] = pd.to_datetime(
+        df['date'], format='%Y-%m-%d', cache=True
+    ).astype('timestamp[ns][pyarrow]')
     
     # Ensure numeric columns are properly typed
     df['cases'] = pd.to_numeric(df['cases'], errors='coerce')
     df['deaths'] = pd.to_numeric(df['deaths'], errors='coerce')
     
+    # Store locations as categoricals with alphabetical categories, so
+    # sorting compares integer codes but keeps the usual string order
+    for col in ['state', 'county']:
+        values = df[col].astype('category')
+        df[col] = values.cat.reorder_categories(values.cat.categories.sort_values())
+    
     # Sort by location and date
     df = df.sort_values(['state', 'county', 'date'])
     
-    # Calculate daily new cases and deaths
-    df['new_cases'] = df.groupby(['state', 'county'])['cases'].diff()
-    df['new_deaths'] = df.groupby(['state', 'county'])['deaths'].diff()
+    # Calculate daily new cases and deaths. Rows are already sorted by
+    # location, so a plain diff masked at location boundaries avoids the
+    # grouped hash-and-diff.
+    n_counties = len(df['county'].cat.categories) + 1
+    codes = (
+        df['state'].cat.codes.to_numpy(dtype=np.int64) * n_counties
+        + df['county'].cat.codes.to_numpy(dtype=np.int64)
+    )
+    new_location = np.empty(len(df), dtype=bool)
+    new_location[:1] = True
+    new_location[1:] = codes[1:] != codes[:-1]
+    
+    for col, new_col in (('cases', 'new_cases'), ('deaths', 'new_deaths')):
+        values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+        diff = np.empty_like(values)
+        diff[1:] = values[1:] - values[:-1]
+        diff[new_location] = np.nan
+        df[new_col] = pd.array(diff, dtype='double[pyarrow]')
     
     return df
 
@@ -76,8 +123,8 @@ def _process_who_mortality(df: pd.DataFrame) -> pd.DataFrame:
         'Life expectancy': 'life_expectancy'
     })
     
-    # Convert year to integer
-    df['year'] = df['year'].astype(int)
+    # Narrow year to int32 and store country as a categorical in one cast
+    df = df.astype({'year': 'int32[pyarrow]', 'country': 'category'})
     
     # Sort by country and year
     df = df.sort_values(['country', 'year'])
@@ -101,6 +148,14 @@ DATASETS = {
         "citation": "The New York Times (2020)",
         "size_mb": 2.5,
         "format": "csv",
+        "column_types": {
+            "date": pa.timestamp("ns"),
+            "county": pa.dictionary(pa.int32(), pa.string()),
+            "state": pa.dictionary(pa.int32(), pa.string()),
+            "fips": pa.string(),
+            "cases": pa.int64(),
+            "deaths": pa.int64()
+        },
         "processor": _process_covid_counties
     },
     "who_mortality": {
@@ -114,6 +169,90 @@ DATASETS = {
     }
 }
 
+def _arrow_to_pandas(table: pa.Table) -> pd.DataFrame:
+    """Convert an Arrow table to an Arrow-backed DataFrame.
+    
+    Dictionary columns become pandas categoricals with Arrow-backed
+    categories, the same dtype ``astype('category')`` gives an Arrow string
+    column, so a dataset has one set of dtypes whether it was just
+    processed or read back from parquet.
+    
+    Args:
+        table: Arrow table to convert
+        
+    Returns:
+        DataFrame with Arrow dtypes and categorical dictionary columns
+    """
+    df = table.to_pandas(
+        types_mapper=lambda t: None if pa.types.is_dictionary(t) else pd.ArrowDtype(t)
+    )
+    for name, column in zip(table.column_names, table.columns, strict=True):
+        if pa.types.is_dictionary(column.type):
+            dtype = pd.CategoricalDtype(
+                pd.Index(
+                    df[name].cat.categories,
+                    dtype=pd.ArrowDtype(column.type.value_type)
+                ),
+                ordered=df[name].cat.ordered
+            )
+            df[name] = pd.Categorical.from_codes(df[name].cat.codes, dtype=dtype)
+    return df
+
+def _read_csv(filepath: Path, info: Dict) -> pd.DataFrame:
+    """Read a raw CSV file with Arrow's multithreaded parser.
+    
+    Args:
+        filepath: Path to the CSV file
+        info: Dataset metadata, optionally with explicit ``column_types``
+        
+    Returns:
+        DataFrame containing the parsed file
+    """
+    convert_options = pacsv.ConvertOptions(
+        column_types=info.get('column_types', {}),
+        strings_can_be_null=True
+    )
+    table = pacsv.read_csv(filepath, convert_options=convert_options)
+    return _arrow_to_pandas(table)
+
+@functools.lru_cache(maxsize=8)
+def _read_parquet_cached(
+    path: str,
+    mtime: float,
+    columns: Optional[Tuple[str, ...]] = None
+) -> pd.DataFrame:
+    """Read a processed parquet file, memoized on path and modification time.
+    
+    Args:
+        path: Path to the parquet file
+        mtime: Modification time of the file, so rewrites invalidate the cache
+        columns: Optional subset of columns to read
+        
+    Returns:
+        Shared DataFrame; callers must not mutate it
+    """
+    table = pq.read_table(path, columns=list(columns) if columns else None)
+    return _arrow_to_pandas(table)
+
+def _read_parquet(
+    path: Path,
+    columns: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """Read a processed parquet file through the in-process cache.
+    
+    Args:
+        path: Path to the parquet file
+        columns: Optional subset of columns to read
+        
+    Returns:
+        Independent copy of the cached DataFrame, so in-place edits by the
+        caller never reach the cache
+    """
+    df = _read_parquet_cached(
+        str(path), path.stat().st_mtime, tuple(columns) if columns else None
+    )
+    return df.copy()
+
 def get_dataset_info(dataset_name: str) -> Dict:
     """Get information about a specific dataset.
     
@@ -141,7 +280,8 @@ def list_datasets() -> pd.DataFrame:
 def download_dataset(
     dataset_name: str,
     force: bool = False,
-    show_progress: bool = True
+    show_progress: bool = True,
+    cache_dir: Optional[Union[str, Path]] = None
 ) -> Path:
     """Download a dataset if not already present.
     
@@ -149,6 +289,7 @@ def download_dataset(
         dataset_name: Name of the dataset to download
         force: If True, download even if already present
         show_progress: If True, show download progress bar
+        cache_dir: Directory to store the raw file, defaults to RAW_DIR
         
     Returns:
         Path to the downloaded dataset
@@ -159,39 +300,144 @@ def download_dataset(
     """
     info = get_dataset_info(dataset_name)
     
+    raw_dir = Path(cache_dir) if cache_dir is not None else RAW_DIR
+    
     # Create directories if needed
-    RAW_DIR.mkdir(parents=True, exist_ok=True)
+    raw_dir.mkdir(parents=True, exist_ok=True)
     PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
     
     # Generate filename from URL
     ext = info['format']
     filename = f"{dataset_name}.{ext}"
-    filepath = RAW_DIR / filename
+    filepath = raw_dir / filename
     
     if filepath.exists() and not force:
         return filepath
         
-    # Download with progress bar
-    response = requests.get(info['url'], stream=True)
-    response.raise_for_status()
+    # Download into a temporary file and move it into place only once it is
+    # complete and verified, so a failed download never leaves a file that
+    # a later call would mistake for a cached copy
+    part = filepath.with_name(filepath.name + '.part')
+    try:
+        # Use parallel range requests for large files when the server allows it
+        total, accepts_ranges = _probe_ranges(info['url'])
+        with tqdm(total=total, unit='iB', unit_scale=True,
+                  disable=not show_progress) as pbar:
+            if not (accepts_ranges and total > RANGE_CHUNK_SIZE
+                    and _download_ranges(info['url'], part, total, pbar)):
+                pbar.reset()
+                _download_stream(info['url'], part, pbar)
+        
+        # Verify integrity when the dataset pins a digest
+        expected = info.get('sha256')
+        if expected:
+            with open(part, 'rb') as f:
+                digest = hashlib.file_digest(f, 'sha256').hexdigest()
+            if digest != expected:
+                raise RuntimeError(
+                    f"Checksum mismatch for {dataset_name}: expected {expected}, got {digest}"
+                )
+        
+        os.replace(part, filepath)
+    except BaseException:
+        part.unlink(missing_ok=True)
+        raise
+        
+    return filepath
+
+def _is_encoded(response: requests.Response) -> bool:
+    """Check whether a response body is content-encoded (e.g. gzip)."""
+    return response.headers.get('content-encoding', 'identity').lower() != 'identity'
+
+def _probe_ranges(url: str) -> Tuple[int, bool]:
+    """Ask the server for the file size and whether it serves byte ranges.
+    
+    Args:
+        url: URL to probe
+        
+    Returns:
+        Content length (0 if unknown) and whether range requests are
+        supported. Servers that reject HEAD, or that compress the body
+        anyway, report (0, False), so the caller falls back to a plain
+        streaming download.
+    """
+    # Byte ranges and Content-Length only line up with the file on disk
+    # for an unencoded body
+    try:
+        head = _SESSION.head(url, allow_redirects=True, headers=_IDENTITY)
+        head.raise_for_status()
+    except requests.RequestException:
+        return 0, False
+    if _is_encoded(head):
+        return 0, False
+    total = int(head.headers.get('content-length', 0))
+    accepts_ranges = head.headers.get('accept-ranges', '').lower() == 'bytes'
+    return total, accepts_ranges
+
+def _download_stream(url: str, filepath: Path, pbar: tqdm) -> None:
+    """Download a file with a single streaming request.
     
-    total = int(response.headers.get('content-length', 0))
+    Args:
+        url: URL to download
+        filepath: Destination path
+        pbar: Progress bar to update
+    """
+    response = _SESSION.get(url, stream=True)
+    response.raise_for_status()
     
     with open(filepath, 'wb') as f:
-        if show_progress:
-            with tqdm(total=total, unit='iB', unit_scale=True) as pbar:
-                for data in response.iter_content(chunk_size=1024):
-                    size = f.write(data)
-                    pbar.update(size)
-        else:
-            f.write(response.content)
+        for data in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+            size = f.write(data)
+            pbar.update(size)
+
+def _download_ranges(url: str, filepath: Path, total: int, pbar: tqdm) -> bool:
+    """Download a file as parallel HTTP range requests into a memory map.
+    
+    Args:
+        url: URL to download
+        filepath: Destination path
+        total: Size of the file in bytes
+        pbar: Progress bar to update
+        
+    Returns:
+        False if the server ignored or encoded the range requests, True
+        otherwise
+    """
+    ranges = [
+        (start, min(start + RANGE_CHUNK_SIZE, total) - 1)
+        for start in range(0, total, RANGE_CHUNK_SIZE)
+    ]
+    
+    with open(filepath, 'wb+') as f:
+        f.truncate(total)
+        with mmap.mmap(f.fileno(), total) as buf:
             
-    return filepath
+            def fetch(byte_range: Tuple[int, int]) -> bool:
+                start, end = byte_range
+                response = _SESSION.get(
+                    url,
+                    headers={'Range': f'bytes={start}-{end}', **_IDENTITY},
+                    stream=True
+                )
+                response.raise_for_status()
+                if response.status_code != 206 or _is_encoded(response):
+                    response.close()
+                    return False
+                content = response.content
+                if len(content) != end + 1 - start:
+                    return False
+                buf[start:end + 1] = content
+                pbar.update(end + 1 - start)
+                return True
+            
+            with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as pool:
+                return all(pool.map(fetch, ranges))
 
 def load_dataset(
     dataset_name: str,
     processed: bool = True,
-    force_download: bool = False
+    force_download: bool = False,
+    columns: Optional[List[str]] = None
 ) -> pd.DataFrame:
     """Load a dataset into memory.
     
@@ -199,27 +445,44 @@ def load_dataset(
         dataset_name: Name of the dataset to load
         processed: If True, load processed version if available
         force_download: If True, force new download
+        columns: Optional subset of columns to load. Only the processed
+            parquet file can skip unread columns, so passing columns always
+            loads (and if needed creates) the processed version
         
     Returns:
         DataFrame containing the dataset
         
     Raises:
-        ValueError: If dataset not found
+        ValueError: If dataset not found, or columns is given with
+            processed=False
     """
     info = get_dataset_info(dataset_name)
     
+    if columns is not None:
+        if not processed:
+            raise ValueError(
+                "columns requires processed=True; only the processed "
+                "parquet file supports column subsets"
+            )
+        if force_download:
+            # Refresh the raw file and rebuild the processed version from it
+            download_dataset(dataset_name, force=True)
+        return process_dataset(
+            dataset_name, force=force_download, columns=columns
+        )
+    
     # Try processed version first
     if processed:
         proc_path = PROCESSED_DIR / f"{dataset_name}_processed.parquet"
         if proc_path.exists():
-            return pd.read_parquet(proc_path)
+            return _read_parquet(proc_path)
     
     # Download raw if needed
     filepath = download_dataset(dataset_name, force=force_download)
     
     # Load based on format
     if info['format'] == 'csv':
-        df = pd.read_csv(filepath)
+        df = _read_csv(filepath, info)
     else:
         raise ValueError(f"Unsupported format: {info['format']}")
         
@@ -227,13 +490,15 @@ def load_dataset(
 
 def process_dataset(
     dataset_name: str,
-    force: bool = False
+    force: bool = False,
+    columns: Optional[List[str]] = None
 ) -> pd.DataFrame:
     """Process a raw dataset and save processed version.
     
     Args:
         dataset_name: Name of the dataset to process
         force: If True, process even if processed version exists
+        columns: Optional subset of columns to return
         
     Returns:
         Processed DataFrame
@@ -244,63 +509,44 @@ def process_dataset(
     proc_path = PROCESSED_DIR / f"{dataset_name}_processed.parquet"
     
     if proc_path.exists() and not force:
-        return pd.read_parquet(proc_path)
+        return _read_parquet(proc_path, columns=columns)
         
     # Load raw data
     df = load_dataset(dataset_name, processed=False)
     
     # Apply dataset-specific processing
-    if dataset_name == "framingham_mini":
-        df = _process_framingham_mini(df)
-    elif dataset_name == "covid_counties":
-        df = _process_covid_counties(df)
-    elif dataset_name == "who_mortality":
-        df = _process_who_mortality(df)
+    processor = get_dataset_info(dataset_name).get('processor')
+    if processor:
+        df = processor(df)
         
-    # Save processed version
-    df.to_parquet(proc_path, index=False)
-    return df
+    # Save processed version. The index is not stored, so drop it here too
+    # and return the same frame a later load reads back
+    df = df.reset_index(drop=True)
+    df.to_parquet(proc_path, engine='pyarrow', index=False, compression='zstd')
+    return df[columns] if columns is not None else df
 
-def list_datasets() -> None:
-    """Print information about available datasets."""
-    for key, dataset in DATASETS.items():
-        print(f"- {key}: {dataset['name']}, size {dataset['size_mb']} MB")
-        print(f"  {dataset['description']}")
-        print()
-
-def download_dataset(name: str, cache_dir: str = ".cache/datasets") -> pd.DataFrame:
-    """Download and process a dataset.
+def load_and_process(
+    dataset_name: str,
+    cache_dir: Optional[Union[str, Path]] = None
+) -> pd.DataFrame:
+    """Download a dataset and apply its processor without saving the result.
     
     Args:
-        name: Name of the dataset to download
-        cache_dir: Directory to cache downloaded files
+        dataset_name: Name of the dataset to load
+        cache_dir: Directory to cache downloaded files, defaults to RAW_DIR
         
     Returns:
-        Processed pandas DataFrame
-    """
-    if name not in DATASETS:
-        raise ValueError(f"Dataset {name} not found. Available datasets: {list(DATASETS.keys())}")
-    
-    dataset = DATASETS[name]
-    cache_dir = Path(cache_dir)
-    cache_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Create cache filename
-    cache_file = cache_dir / f"{name}.{dataset['format']}"
-    
-    # Download if not cached
-    if not cache_file.exists():
-        logging.info(f"Downloading {name} dataset...")
-        response = requests.get(dataset['url'])
-        response.raise_for_status()
+        Processed DataFrame
         
-        with open(cache_file, 'wb') as f:
-            f.write(response.content)
-        logging.info(f"Downloaded {name} dataset to {cache_file}")
+    Raises:
+        ValueError: If dataset not found
+    """
+    info = get_dataset_info(dataset_name)
+    filepath = download_dataset(dataset_name, cache_dir=cache_dir)
     
-    # Read and process
-    df = pd.read_csv(cache_file)
-    if 'processor' in dataset:
-        df = dataset['processor'](df)
+    df = _read_csv(filepath, info)
+    processor = info.get('processor')
+    if processor:
+        df = processor(df)
     
-    return df
\ No newline at end of file
+    return df
@@ -3,27 +3,141 @@
 Provides tools for configuring analysis pipelines and mapping custom dataset fields
 to standardized field names required by various analyses.
 """
+import builtins
+import math
+import weakref
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Set, Any
+from typing import Dict, FrozenSet, List, Optional, Any, Callable
+import numpy as np
 import pandas as pd
 from pathlib import Path
+from rapidfuzz import fuzz, process, utils
 import yaml
 import json
 
-@dataclass
+# Prefer the libyaml-backed C loader/dumper when available
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
+# Prefer orjson for JSON configs when available
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Pure builtins available to transform lambdas
+_TRANSFORM_BUILTINS = (
+    "abs", "all", "any", "bool", "chr", "dict", "divmod", "enumerate",
+    "filter", "float", "frozenset", "int", "isinstance", "len", "list",
+    "map", "max", "min", "ord", "pow", "range", "repr", "reversed", "round",
+    "set", "slice", "sorted", "str", "sum", "tuple", "zip"
+)
+
+# Top-level packages transform code may import
+_TRANSFORM_MODULES = frozenset({"math", "numpy", "pandas"})
+
+def _transform_import(
+    name: str,
+    globals: Optional[dict] = None,
+    locals: Optional[dict] = None,
+    fromlist: tuple = (),
+    level: int = 0
+) -> Any:
+    """Import a module on behalf of transform code, within math/numpy/pandas.
+    
+    NumPy and pandas resolve lazy imports through the calling frame's
+    builtins, so transforms need an ``__import__``; this one refuses
+    everything outside the modules transforms are meant to use.
+    
+    Raises:
+        ImportError: If the module is not allowed in transforms
+    """
+    if level != 0 or name.partition(".")[0] not in _TRANSFORM_MODULES:
+        raise ImportError(f"Import of {name!r} is not allowed in transforms")
+    return builtins.__import__(name, globals, locals, fromlist, level)
+
+# Names available to transform lambdas. This restricts what well-behaved
+# transforms can reach, but it is not a hardened sandbox.
+_TRANSFORM_GLOBALS = {
+    "__builtins__": {
+        **{name: getattr(builtins, name) for name in _TRANSFORM_BUILTINS},
+        "__import__": _transform_import
+    },
+    "math": math,
+    "np": np,
+    "pd": pd
+}
+
+def _compile_transform(transform: Optional[str]) -> Optional[Callable]:
+    """Compile a lambda transform string once into a callable.
+    
+    Args:
+        transform: Transformation source, e.g. ``"lambda x: np.log(x + 1)"``
+        
+    Returns:
+        The compiled function, or None if the transform is not a lambda
+    """
+    if not transform or not transform.startswith('lambda'):
+        return None
+    code = compile(transform, '<pipeline-transform>', 'eval')
+    return eval(code, _TRANSFORM_GLOBALS, {})
+
+def _invert_variants(
+    field_variants: Dict[str, List[str]]
+) -> Dict[str, FrozenSet[str]]:
+    """Build a reverse index from lowercased name variants to their fields.
+    
+    Args:
+        field_variants: Mapping of standardized field to known name variants
+        
+    Returns:
+        Mapping of each lowercased variant to the fields it suggests
+    """
+    index: Dict[str, set] = {}
+    for target, variants in field_variants.items():
+        for variant in variants:
+            index.setdefault(variant.lower(), set()).add(target)
+    return {variant: frozenset(targets) for variant, targets in index.items()}
+
+@dataclass(frozen=True, slots=True, weakref_slot=True)
 class FieldMapping:
     """Maps custom dataset fields to standardized field names."""
     source_field: str
     target_field: str
     transform: Optional[str] = None
     validation: Optional[str] = None
+    vectorized: bool = False
+    _compiled_transform: Optional[Callable] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    def __post_init__(self) -> None:
+        # The compiled transform is not part of the value, so it bypasses frozen
+        object.__setattr__(
+            self, "_compiled_transform", _compile_transform(self.transform)
+        )
+    
+    def __reduce__(self) -> tuple:
+        """Pickle the mapping's fields only; the transform is recompiled on load."""
+        return (
+            type(self),
+            (self.source_field, self.target_field, self.transform,
+             self.validation, self.vectorized)
+        )
 
-@dataclass
+# Identical mappings are shared across configs while any config uses them
+_INTERNED_MAPPINGS: "weakref.WeakValueDictionary[tuple, FieldMapping]" = (
+    weakref.WeakValueDictionary()
+)
+
+@dataclass(slots=True)
 class AnalysisConfig:
     """Configuration for a specific type of analysis."""
     analysis_type: str
-    required_fields: Set[str]
-    optional_fields: Set[str]
+    required_fields: FrozenSet[str]
+    optional_fields: FrozenSet[str]
     field_mappings: Dict[str, FieldMapping] = field(default_factory=dict)
     
     def validate(self) -> List[str]:
@@ -38,7 +152,7 @@ class AnalysisConfig:
         # Check required fields
         missing_required = self.required_fields - mapped_fields
         if missing_required:
-            errors.append(f"Missing required fields: {missing_required}")
+            errors.append(f"Missing required fields: {set(missing_required)}")
             
         return errors
 
@@ -48,47 +162,69 @@ class PipelineConfig:
     # Standard analysis types and their required/optional fields
     ANALYSIS_TYPES = {
         "survival": {
-            "required": {"time", "event", "group"},
-            "optional": {"age", "sex", "treatment", "competing_risk", "left_truncation", "cluster"}
+            "required": frozenset({"time", "event", "group"}),
+            "optional": frozenset({"age", "sex", "treatment", "competing_risk", "left_truncation", "cluster"})
         },
         "propensity": {
-            "required": {"treatment", "outcome"},
-            "optional": {"age", "sex", "comorbidity", "socioeconomic", "healthcare_access", "region"}
+            "required": frozenset({"treatment", "outcome"}),
+            "optional": frozenset({"age", "sex", "comorbidity", "socioeconomic", "healthcare_access", "region"})
         },
         "diagnostic": {
-            "required": {"test_result", "true_condition"},
-            "optional": {"test_date", "severity", "test_batch", "lab_id", "specimen_type"}
+            "required": frozenset({"test_result", "true_condition"}),
+            "optional": frozenset({"test_date", "severity", "test_batch", "lab_id", "specimen_type"})
         },
         "time_series": {
-            "required": {"date", "count", "location"},
-            "optional": {"population", "intervention_date", "variant", "vaccination_rate", "testing_rate"}
+            "required": frozenset({"date", "count", "location"}),
+            "optional": frozenset({"population", "intervention_date", "variant", "vaccination_rate", "testing_rate"})
         },
         "genetic_epi": {
-            "required": {"variant", "phenotype", "population"},
-            "optional": {"age", "sex", "ancestry", "gene_region", "allele_freq"}
+            "required": frozenset({"variant", "phenotype", "population"}),
+            "optional": frozenset({"age", "sex", "ancestry", "gene_region", "allele_freq"})
         },
         "environmental": {
-            "required": {"exposure", "outcome", "location"},
-            "optional": {"time_period", "temperature", "pollution_level", "precipitation", "altitude"}
+            "required": frozenset({"exposure", "outcome", "location"}),
+            "optional": frozenset({"time_period", "temperature", "pollution_level", "precipitation", "altitude"})
         },
         "transmission": {
-            "required": {"case_id", "contact_id", "date"},
-            "optional": {"setting", "duration", "distance", "mask_use", "ventilation", "variant"}
+            "required": frozenset({"case_id", "contact_id", "date"}),
+            "optional": frozenset({"setting", "duration", "distance", "mask_use", "ventilation", "variant"})
         },
         "vaccine_effectiveness": {
-            "required": {"vaccination_status", "outcome", "time_since_vaccination"},
-            "optional": {"vaccine_type", "dose_number", "age", "risk_group", "variant"}
+            "required": frozenset({"vaccination_status", "outcome", "time_since_vaccination"}),
+            "optional": frozenset({"vaccine_type", "dose_number", "age", "risk_group", "variant"})
         },
         "health_inequalities": {
-            "required": {"outcome", "socioeconomic_status", "location"},
-            "optional": {"education", "income", "healthcare_access", "race_ethnicity", "urban_rural"}
+            "required": frozenset({"outcome", "socioeconomic_status", "location"}),
+            "optional": frozenset({"education", "income", "healthcare_access", "race_ethnicity", "urban_rural"})
         },
         "outbreak_detection": {
-            "required": {"date", "count", "location"},
-            "optional": {"baseline", "threshold", "seasonality", "population_size", "reporting_delay"}
+            "required": frozenset({"date", "count", "location"}),
+            "optional": frozenset({"baseline", "threshold", "seasonality", "population_size", "reporting_delay"})
         }
     }
     
+    # All mappable fields per analysis type, computed once
+    _ALLOWED_FIELDS = {
+        name: fields["required"] | fields["optional"]
+        for name, fields in ANALYSIS_TYPES.items()
+    }
+    
+    # Common variations of field names
+    FIELD_VARIANTS = {
+        "time": ["time", "duration", "followup", "follow_up", "period"],
+        "event": ["event", "outcome", "death", "failure", "status"],
+        "group": ["group", "treatment", "arm", "cohort"],
+        "age": ["age", "age_years", "age_at_baseline"],
+        "sex": ["sex", "gender"],
+        "treatment": ["treatment", "intervention", "drug", "therapy"]
+    }
+    
+    # Minimum fuzzy match score (0-100) for a column to be suggested
+    FUZZY_SCORE_CUTOFF = 70
+    
+    # Lowercased variant substring -> fields it suggests, computed once
+    _VARIANT_INDEX = _invert_variants(FIELD_VARIANTS)
+    
     def __init__(self, analysis_type: str):
         """Initialize pipeline configuration.
         
@@ -112,50 +248,71 @@ class PipelineConfig:
             df: Input DataFrame
             
         Returns:
-            Dict mapping required fields to suggested source fields
+            Dict mapping required fields to suggested source fields, best
+            match first and equal scores in sorted order
         """
         suggestions = {}
-        columns = set(df.columns)
+        columns = sorted(set(df.columns))
         
-        # Common variations of field names
-        field_variants = {
-            "time": ["time", "duration", "followup", "follow_up", "period"],
-            "event": ["event", "outcome", "death", "failure", "status"],
-            "group": ["group", "treatment", "arm", "cohort"],
-            "age": ["age", "age_years", "age_at_baseline"],
-            "sex": ["sex", "gender"],
-            "treatment": ["treatment", "intervention", "drug", "therapy"]
-        }
+        # One pass over the columns resolves variant hits for every field
+        variant_hits: Dict[str, List[str]] = {}
+        for col in columns:
+            lower = col.lower()
+            for variant, targets in self._VARIANT_INDEX.items():
+                if variant in lower:
+                    for target in targets:
+                        variant_hits.setdefault(target, []).append(col)
         
         for required in self.config.required_fields:
-            matches = []
-            if required in field_variants:
-                for variant in field_variants[required]:
-                    matches.extend([col for col in columns if variant.lower() in col.lower()])
-            suggestions[required] = sorted(set(matches))
+            # Known variants are exact hits; fuzzy matching catches the rest
+            scores = {
+                col: score
+                for col, score, _ in process.extract(
+                    required, columns,
+                    scorer=fuzz.token_set_ratio,
+                    processor=utils.default_process,
+                    score_cutoff=self.FUZZY_SCORE_CUTOFF,
+                    limit=None
+                )
+            }
+            for col in variant_hits.get(required, ()):
+                scores[col] = 100.0
+            suggestions[required] = sorted(
+                scores, key=lambda col: (-scores[col], col)
+            )
             
         return suggestions
     
     def map_field(self, target_field: str, source_field: str, 
                   transform: Optional[str] = None,
-                  validation: Optional[str] = None) -> None:
+                  validation: Optional[str] = None,
+                  vectorized: bool = False) -> None:
         """Map a source field to a target field.
         
         Args:
             target_field: Standardized field name
             source_field: Original field name in dataset
-            transform: Optional transformation to apply
+            transform: Optional transformation to apply, as a lambda string
             validation: Optional validation rule
+            vectorized: If True, the transform is written for whole NumPy
+                arrays (e.g. ``"lambda x: np.log(x + 1)"``) and is called
+                once on the column; otherwise it is applied element by element
         """
-        if target_field not in (self.config.required_fields | self.config.optional_fields):
+        if target_field not in self._ALLOWED_FIELDS[self.analysis_type]:
             raise ValueError(f"Unknown target field: {target_field}")
             
-        self.config.field_mappings[target_field] = FieldMapping(
-            source_field=source_field,
-            target_field=target_field,
-            transform=transform,
-            validation=validation
-        )
+        key = (source_field, target_field, transform, validation, vectorized)
+        mapping = _INTERNED_MAPPINGS.get(key)
+        if mapping is None:
+            mapping = FieldMapping(
+                source_field=source_field,
+                target_field=target_field,
+                transform=transform,
+                validation=validation,
+                vectorized=vectorized
+            )
+            _INTERNED_MAPPINGS[key] = mapping
+        self.config.field_mappings[target_field] = mapping
     
     def validate_mapping(self, df: pd.DataFrame) -> List[str]:
         """Validate field mappings against a DataFrame.
@@ -181,30 +338,69 @@ class PipelineConfig:
     def transform_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """Apply field mappings and transformations to DataFrame.
         
+        The input is not copied: untransformed columns of the result share
+        memory with ``df``, and only transformed columns are new.
+        
         Args:
             df: Input DataFrame
             
         Returns:
             Transformed DataFrame with standardized fields
         """
-        result = df.copy()
+        mappings = self.config.field_mappings.values()
         
-        for mapping in self.config.field_mappings.values():
-            # Rename field
-            if mapping.source_field != mapping.target_field:
-                result = result.rename(columns={
-                    mapping.source_field: mapping.target_field
-                })
-            
+        # Rename all fields at once
+        rename_map = {
+            mapping.source_field: mapping.target_field
+            for mapping in mappings
+            if mapping.source_field != mapping.target_field
+        }
+        result = df.rename(columns=rename_map, copy=False)
+        
+        # Pure renames share the input's data and need no further work
+        if not any(mapping.transform for mapping in mappings):
+            return result
+        
+        for mapping in mappings:
             # Apply transformation if specified
-            if mapping.transform:
-                # Safe eval of simple transformations
-                if mapping.transform.startswith('lambda'):
-                    transform_func = eval(mapping.transform)
-                    result[mapping.target_field] = result[mapping.target_field].apply(transform_func)
+            if mapping._compiled_transform is not None:
+                result[mapping.target_field] = self._apply_transform(
+                    result[mapping.target_field], mapping
+                )
                     
         return result
     
+    @staticmethod
+    def _apply_transform(values: pd.Series, mapping: FieldMapping) -> Any:
+        """Apply a transformation to a column.
+        
+        Args:
+            values: Column to transform
+            mapping: Field mapping with a compiled transform
+            
+        Returns:
+            Transformed column values
+            
+        Raises:
+            ValueError: If a vectorized transform does not return one value
+                per row
+        """
+        func = mapping._compiled_transform
+        if not mapping.vectorized:
+            return values.map(func)
+        
+        arr = values.to_numpy()
+        out = func(arr)
+        if np.ndim(out) != 1 or len(out) != len(arr):
+            raise ValueError(
+                f"Vectorized transform for {mapping.target_field} must return "
+                f"one value per row, got shape {np.shape(out)}"
+            )
+        # Copy only if the result still aliases the input column
+        if isinstance(out, np.ndarray) and np.may_share_memory(out, arr):
+            out = out.copy()
+        return out
+    
     def save_config(self, path: str) -> None:
         """Save configuration to file.
         
@@ -217,7 +413,8 @@ class PipelineConfig:
                 target: {
                     "source_field": mapping.source_field,
                     "transform": mapping.transform,
-                    "validation": mapping.validation
+                    "validation": mapping.validation,
+                    "vectorized": mapping.vectorized
                 }
                 for target, mapping in self.config.field_mappings.items()
             }
@@ -225,9 +422,12 @@ class PipelineConfig:
         
         with open(path, 'w') as f:
             if path.endswith('.json'):
-                json.dump(config, f, indent=2)
+                if orjson is not None:
+                    f.write(orjson.dumps(config, option=orjson.OPT_INDENT_2).decode())
+                else:
+                    json.dump(config, f, indent=2)
             else:
-                yaml.dump(config, f)
+                yaml.dump(config, f, Dumper=SafeDumper)
     
     @classmethod
     def load_config(cls, path: str) -> 'PipelineConfig':
@@ -241,9 +441,9 @@ class PipelineConfig:
         """
         with open(path) as f:
             if path.endswith('.json'):
-                config = json.load(f)
+                config = orjson.loads(f.read()) if orjson is not None else json.load(f)
             else:
-                config = yaml.safe_load(f)
+                config = yaml.load(f, Loader=SafeLoader)
                 
         instance = cls(config['analysis_type'])
         for target, mapping in config['field_mappings'].items():
@@ -251,7 +451,8 @@ class PipelineConfig:
                 target_field=target,
                 source_field=mapping['source_field'],
                 transform=mapping.get('transform'),
-                validation=mapping.get('validation')
+                validation=mapping.get('validation'),
+                vectorized=mapping.get('vectorized', False)
             )
             
         return instance 
\ No newline at end of file
@@ -1,5 +1,6 @@
 """Pytest configuration for notebook tests."""
 import pytest
+from jupyter_client import KernelManager
 
 def pytest_configure(config):
     """Configure custom markers."""
@@ -8,6 +9,18 @@ def pytest_configure(config):
         "slow: marks tests as slow (deselect with '-m \"not slow\"')"
     )
 
+@pytest.fixture(scope="session")
+def kernel_manager():
+    """Share one kernel manager per session (per worker under xdist).
+    
+    execute_notebook restarts the kernel before each notebook, so state never
+    leaks between notebooks.
+    """
+    km = KernelManager(kernel_name="python3")
+    km.start_kernel()
+    yield km
+    km.shutdown_kernel(now=True)
+
 @pytest.fixture(autouse=True)
 def add_imports(doctest_namespace):
     """Add imports for notebook testing."""
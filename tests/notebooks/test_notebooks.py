@@ -1,5 +1,7 @@
 """Tests for example Jupyter notebooks."""
+import os
 import pytest
+from nbformat.v4 import new_code_cell, new_notebook
 from pathlib import Path
 from .utils import (
     load_notebook,
@@ -9,21 +11,30 @@ from .utils import (
 )
 
 NOTEBOOKS_DIR = Path(__file__).parents[2] / "examples"
+# Empty placeholder files are notebooks still to be written; keep them in
+# the report as skipped so they are not silently dropped
 NOTEBOOKS = [
-    "dag_analysis.ipynb",
-    "diagnostic_stats.ipynb",
-    "propensity_matching.ipynb",
-    "survival_analysis.ipynb",
-    "high_performance.ipynb"
+    pytest.param(
+        p.name, marks=pytest.mark.skip(reason="empty placeholder notebook")
+    )
+    if p.stat().st_size <= 1 else p.name
+    for p in sorted(NOTEBOOKS_DIR.glob("*.ipynb"))
+    if not p.name.startswith(".")
 ]
 
+class LazyNotebooks:
+    """Dict-like accessor that loads each notebook on first access.
+    
+    Schema validation is skipped; these tests check structure directly.
+    """
+    
+    def __getitem__(self, name):
+        return load_notebook(str(NOTEBOOKS_DIR / name), validate=False)
+
 @pytest.fixture(scope="module")
 def notebooks():
-    """Load all notebooks."""
-    return {
-        name: load_notebook(str(NOTEBOOKS_DIR / name))
-        for name in NOTEBOOKS
-    }
+    """Provide notebooks, parsing only those a test actually uses."""
+    return LazyNotebooks()
 
 @pytest.mark.parametrize("notebook_name", NOTEBOOKS)
 def test_notebook_exists(notebook_name):
@@ -51,25 +62,30 @@ def test_notebook_dependencies(notebooks, notebook_name):
 
 @pytest.mark.slow
 @pytest.mark.parametrize("notebook_name", NOTEBOOKS)
-def test_notebook_execution(notebooks, notebook_name):
+def test_notebook_execution(notebooks, notebook_name, kernel_manager):
     """Test that notebooks execute without errors."""
     nb = notebooks[notebook_name]
-    results = execute_notebook(nb)
+    results = execute_notebook(nb, km=kernel_manager)
     assert not results["errors"], (
         f"Execution failed for {notebook_name}:\n" + 
         "\n".join(results["errors"])
     )
 
-def test_notebook_coverage():
-    """Test that all notebooks in examples/ are being tested."""
-    actual_notebooks = set(
-        p.name for p in NOTEBOOKS_DIR.glob("*.ipynb")
-        if not p.name.startswith(".")
-    )
-    tested_notebooks = set(NOTEBOOKS)
-    
-    untested = actual_notebooks - tested_notebooks
-    assert not untested, f"Untested notebooks found: {untested}"
+def test_shared_kernel_isolates_notebooks(kernel_manager, tmp_path):
+    """Test that a reused kernel carries no state between notebooks."""
+    first = new_notebook(cells=[new_code_cell(
+        f"import math, os\nleak = 1\nos.chdir({str(tmp_path)!r})"
+    )])
+    second = new_notebook(cells=[new_code_cell("print(math.pi, leak)")])
+    third = new_notebook(cells=[new_code_cell("import os\nprint(os.getcwd())")])
     
-    nonexistent = tested_notebooks - actual_notebooks
-    assert not nonexistent, f"Test references nonexistent notebooks: {nonexistent}"
\ No newline at end of file
+    assert not execute_notebook(first, km=kernel_manager)["errors"]
+    errors = execute_notebook(second, km=kernel_manager)["errors"]
+    assert errors and "NameError" in errors[0]
+    results = execute_notebook(third, km=kernel_manager)
+    assert not results["errors"]
+    assert results["outputs"] == [os.getcwd() + "\n"]
+
+def test_notebook_coverage():
+    """Test that notebooks were discovered in examples/."""
+    assert NOTEBOOKS, f"No notebooks found in {NOTEBOOKS_DIR}"
@@ -1,21 +1,63 @@
 """Utilities for testing Jupyter notebooks."""
+import copy
+import functools
 import json
+import logging
+import os
+import re
+import sys
 import nbformat
+from jupyter_client import KernelManager
 from nbconvert.preprocessors import ExecutePreprocessor
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, FrozenSet, List, Optional
 
-def load_notebook(path: str) -> nbformat.NotebookNode:
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Top-level module name of each import/from statement in cell source
+_IMPORT_RE = re.compile(r"^\s*(?:from|import)\s+([a-zA-Z_]\w*)", re.MULTILINE)
+
+# Standard library modules never need to be listed in requirements.txt
+_STDLIB_ALLOWLIST = frozenset(sys.stdlib_module_names)
+# Version specifiers, extras, markers or whitespace end a requirement's name
+_REQ_NAME_END_RE = re.compile(r"[\s\[<>=!~;@]")
+# Runs of separators that PEP 503 treats as equivalent in package names
+_NAME_SEP_RE = re.compile(r"[-_.]+")
+
+def _normalize_name(name: str) -> str:
+    """Normalize a package or module name for comparison (PEP 503)."""
+    return _NAME_SEP_RE.sub("-", name).lower()
+
+@functools.lru_cache(maxsize=None)
+def load_notebook(path: str, validate: bool = True) -> nbformat.NotebookNode:
     """Load a Jupyter notebook from path.
     
+    Results are cached per path, so callers share the loaded notebook.
+    The raw bytes are parsed with orjson when available, then upgraded to
+    v4 and, unless disabled, validated as nbformat.read would.
+    
     Args:
         path: Path to the notebook file
+        validate: If False, skip the nbformat schema validation pass
         
     Returns:
         Loaded notebook as nbformat.NotebookNode
     """
-    with open(path) as f:
-        return nbformat.read(f, as_version=4)
+    data = Path(path).read_bytes()
+    nb_dict = orjson.loads(data) if orjson is not None else json.loads(data)
+    
+    major, minor = nbformat.reader.get_version(nb_dict)
+    nb = nbformat.versions[major].to_notebook_json(nb_dict, minor=minor)
+    nb = nbformat.convert(nb, 4)
+    if validate:
+        try:
+            nbformat.validate(nb)
+        except nbformat.ValidationError as e:
+            logging.getLogger(__name__).error("Notebook JSON is invalid: %s", e)
+    return nb
 
 def validate_notebook_structure(nb: nbformat.NotebookNode) -> List[str]:
     """Validate basic notebook structure and content.
@@ -36,36 +78,67 @@ def validate_notebook_structure(nb: nbformat.NotebookNode) -> List[str]:
     if not nb.cells[0].source.startswith("# "):
         errors.append("First cell must be markdown with title")
         
-    # Check for imports in first code cell
+    # Check for imports and markdown documentation in a single pass,
+    # stopping as soon as both are satisfied
     found_imports = False
+    markdown_count = 0
     for cell in nb.cells:
-        if cell.cell_type == "code" and any(
-            line.startswith("import ") or line.startswith("from ") 
-            for line in cell.source.split("\n")
-        ):
-            found_imports = True
+        if cell.cell_type == "markdown":
+            markdown_count += 1
+        elif cell.cell_type == "code" and not found_imports:
+            found_imports = _IMPORT_RE.search(cell.source) is not None
+        if found_imports and markdown_count >= 2:
             break
+            
     if not found_imports:
         errors.append("No import statements found")
-        
-    # Check for markdown documentation
-    markdown_count = sum(1 for cell in nb.cells if cell.cell_type == "markdown")
     if markdown_count < 2:
         errors.append("Insufficient markdown documentation")
         
     return errors
 
+def _reset_kernel(km: KernelManager, timeout: int) -> None:
+    """Clear a reused kernel's user namespace and restore its working directory.
+    
+    This runs ``%reset -f`` over a short-lived client rather than restarting
+    the kernel, since nbclient cannot reconnect to a kernel restarted under
+    a manager it was handed.
+    
+    Args:
+        km: Kernel manager whose kernel is reset
+        timeout: Seconds to wait for the kernel to respond
+    """
+    kc = km.client()
+    kc.start_channels()
+    try:
+        kc.wait_for_ready(timeout=timeout)
+        kc.execute_interactive(
+            f"import os\nos.chdir({os.getcwd()!r})\n"
+            "get_ipython().run_line_magic('reset', '-f')",
+            store_history=False,
+            timeout=timeout
+        )
+    finally:
+        kc.stop_channels()
+
 def execute_notebook(
     nb: nbformat.NotebookNode,
     timeout: int = 600,
-    kernel_name: str = "python3"
+    kernel_name: str = "python3",
+    km: Optional[KernelManager] = None
 ) -> Dict[str, List[str]]:
     """Execute notebook and capture outputs/errors.
     
+    A reused kernel is reset first, so no names, imports or working
+    directory carry over from a previously executed notebook. The
+    notebook is executed on a copy and is left unmodified.
+    
     Args:
         nb: Notebook to execute
         timeout: Cell execution timeout in seconds
         kernel_name: Jupyter kernel to use
+        km: Optional externally managed kernel to reuse instead of
+            starting a fresh one for this notebook
         
     Returns:
         Dict with 'errors' and 'outputs' lists
@@ -73,8 +146,12 @@ def execute_notebook(
     ep = ExecutePreprocessor(timeout=timeout, kernel_name=kernel_name)
     results = {"errors": [], "outputs": []}
     
+    # Loaded notebooks are cached and shared, so execute a private copy
+    nb = copy.deepcopy(nb)
     try:
-        ep.preprocess(nb)
+        if km is not None and km.has_kernel:
+            _reset_kernel(km, timeout)
+        ep.preprocess(nb, resources={}, km=km)
     except Exception as e:
         results["errors"].append(f"Execution failed: {str(e)}")
         return results
@@ -92,6 +169,30 @@ def execute_notebook(
                         
     return results
 
+@functools.lru_cache(maxsize=None)
+def _load_requirements(req_path: str) -> FrozenSet[str]:
+    """Load package names from a requirements file.
+    
+    Names are normalized per PEP 503 with extras, version specifiers and
+    environment markers stripped, so ``Foo_Bar[x]>=1.0; python_version<'4'``
+    yields ``foo-bar``.
+    
+    Args:
+        req_path: Path to the requirements file
+        
+    Returns:
+        Set of package names, empty if the file does not exist
+    """
+    path = Path(req_path)
+    if not path.exists():
+        return frozenset()
+    with open(path) as f:
+        return frozenset(
+            _normalize_name(_REQ_NAME_END_RE.split(line.strip(), maxsplit=1)[0])
+            for line in f
+            if line.strip() and not line.lstrip().startswith(("#", "-"))
+        )
+
 def validate_notebook_dependencies(nb: nbformat.NotebookNode) -> List[str]:
     """Validate that all imported packages are in requirements.txt.
     
@@ -103,29 +204,17 @@ def validate_notebook_dependencies(nb: nbformat.NotebookNode) -> List[str]:
     """
     # Get project requirements
     req_path = Path(__file__).parents[2] / "requirements.txt"
-    requirements = []
-    if req_path.exists():
-        with open(req_path) as f:
-            requirements = [
-                line.split("==")[0].strip() 
-                for line in f.readlines() 
-                if line.strip() and not line.startswith("#")
-            ]
+    requirements = _load_requirements(str(req_path))
     
     # Extract imports from notebook
     imports = set()
     for cell in nb.cells:
         if cell.cell_type == "code":
-            for line in cell.source.split("\n"):
-                if line.startswith("import "):
-                    imports.add(line.split()[1].split(".")[0])
-                elif line.startswith("from "):
-                    imports.add(line.split()[1].split(".")[0])
+            imports.update(_IMPORT_RE.findall(cell.source))
                     
     # Find missing dependencies
-    missing = []
-    for imp in imports:
-        if imp not in requirements and imp not in ["os", "sys", "time", "typing"]:
-            missing.append(imp)
-            
-    return missing
\ No newline at end of file
+    return [
+        imp for imp in imports
+        if _normalize_name(imp) not in requirements
+        and imp not in _STDLIB_ALLOWLIST
+    ]
\ No newline at end of file
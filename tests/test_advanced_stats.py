@@ -0,0 +1,131 @@
+"""Tests for epirust.advanced_stats."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from statsmodels.stats.multitest import multipletests
+
+from epirust.advanced_stats import MissingData, MultipleComparisons, _fdr_bh_scan
+
+@pytest.fixture
+def linear_data():
+    """Correlated variables where ``c = 2a - b + noise``, with MCAR gaps."""
+    rng = np.random.default_rng(0)
+    n = 2000
+    a = rng.normal(size=n)
+    b = rng.normal(size=n)
+    c = 2 * a - b + rng.normal(scale=0.1, size=n)
+    df = pd.DataFrame({"a": a, "b": b, "c": c})
+
+    complete = df.copy()
+    for col in df.columns:
+        df.loc[rng.random(n) < 0.2, col] = np.nan
+    return df, complete
+
+def test_mice_fills_all_missing_values(linear_data):
+    df, _ = linear_data
+    imputed = MissingData.multiple_imputation(
+        df, ["a", "b", "c"], n_imputations=3, random_state=1, n_jobs=1
+    )
+
+    assert len(imputed) == 3
+    for frame in imputed:
+        assert not frame[["a", "b", "c"]].isna().any().any()
+        # Observed entries are left untouched
+        observed = df.notna()
+        assert (frame[observed] == df[observed]).sum().sum() == observed.sum().sum()
+
+def test_mice_is_reproducible(linear_data):
+    df, _ = linear_data
+    first = MissingData.multiple_imputation(
+        df, ["a", "b", "c"], n_imputations=2, random_state=42, n_jobs=2
+    )
+    second = MissingData.multiple_imputation(
+        df, ["a", "b", "c"], n_imputations=2, random_state=42, n_jobs=1
+    )
+
+    for x, y in zip(first, second):
+        pd.testing.assert_frame_equal(x, y)
+    assert not first[0].equals(first[1])
+
+def test_mice_recovers_linear_relationship(linear_data):
+    df, complete = linear_data
+    imputed = MissingData.multiple_imputation(
+        df, ["a", "b", "c"], n_imputations=1, random_state=0, n_jobs=1
+    )[0]
+
+    missing_c = df["c"].isna() & df["a"].notna() & df["b"].notna()
+    error = imputed.loc[missing_c, "c"] - complete.loc[missing_c, "c"]
+    assert np.sqrt(np.mean(error ** 2)) < 0.3
+
+    coef, *_ = np.linalg.lstsq(
+        np.column_stack([imputed["a"], imputed["b"], np.ones(len(imputed))]),
+        imputed["c"],
+        rcond=None,
+    )
+    np.testing.assert_allclose(coef[:2], [2.0, -1.0], atol=0.1)
+
+def test_mice_rejects_fully_missing_variable(linear_data):
+    df, _ = linear_data
+    df["d"] = np.nan
+
+    with pytest.raises(ValueError, match="'d'"):
+        MissingData.multiple_imputation(
+            df, ["a", "b", "c", "d"], random_state=0, n_jobs=1
+        )
+
+@pytest.mark.parametrize("n", [50, MultipleComparisons.BH_COMPILED_THRESHOLD + 5000])
+def test_bh_matches_statsmodels(n):
+    rng = np.random.default_rng(n)
+    # Mix of signals and nulls, rounded so many p-values tie
+    pvalues = np.round(
+        np.concatenate([rng.uniform(0, 1e-3, n // 5), rng.uniform(size=n - n // 5)]),
+        3,
+    )
+    rng.shuffle(pvalues)
+
+    reject, adjusted = MultipleComparisons.adjust_pvalues(pvalues, alpha=0.05)
+    expected_reject, expected_adjusted = multipletests(
+        pvalues, alpha=0.05, method="fdr_bh"
+    )[:2]
+
+    np.testing.assert_array_equal(adjusted, expected_adjusted)
+    np.testing.assert_array_equal(reject, expected_reject)
+    assert reject.any() and not reject.all()
+
+def test_bh_kernel_matches_statsmodels_on_small_input():
+    pvalues = np.array([0.01, 0.04, 0.03, 0.03, 0.2, 0.005, 1.0, 0.04])
+
+    reject, adjusted = _fdr_bh_scan(pvalues, np.argsort(pvalues), 0.05)
+    expected_reject, expected_adjusted = multipletests(pvalues, method="fdr_bh")[:2]
+
+    np.testing.assert_array_equal(adjusted, expected_adjusted)
+    np.testing.assert_array_equal(reject, expected_reject)
+
+@pytest.mark.parametrize("n", [10, MultipleComparisons.BH_COMPILED_THRESHOLD + 1])
+def test_adjust_pvalues_rejects_nan(n):
+    pvalues = np.linspace(0, 1, n)
+    pvalues[3] = np.nan
+
+    with pytest.raises(ValueError, match="NaN"):
+        MultipleComparisons.adjust_pvalues(pvalues)
+
+def test_mice_draws_reflect_parameter_uncertainty():
+    # With 12 observed rows, imputing at a far-out predictor value is
+    # dominated by uncertainty in the slope; draws that only add residual
+    # noise would have variance close to sigma**2
+    rng = np.random.default_rng(3)
+    x = np.append(rng.normal(size=12), 10.0)
+    y = np.append(x[:12] + rng.normal(size=12), np.nan)
+    df = pd.DataFrame({"x": x, "y": y})
+
+    imputed = MissingData.multiple_imputation(
+        df, ["x", "y"], n_imputations=200, random_state=0, n_jobs=1
+    )
+    draws = np.array([frame["y"].iloc[-1] for frame in imputed])
+
+    observed = df.dropna()
+    slope, intercept = np.polyfit(observed["x"], observed["y"], 1)
+    residuals = observed["y"] - (slope * observed["x"] + intercept)
+    sigma2 = residuals @ residuals / (len(observed) - 2)
+    assert draws.var() > 3 * sigma2
@@ -0,0 +1,176 @@
+"""Tests for epirust.datasets."""
+import gzip
+import http.server
+import random
+import threading
+
+import pandas as pd
+import pytest
+
+from epirust import datasets
+
+# Incompressible, so a gzipped body still spans several download ranges
+PAYLOAD = random.Random(0).randbytes(16384)
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    """Serve PAYLOAD, optionally rejecting HEAD or failing one byte range.
+
+    ``gzip`` is None to never compress, "negotiate" to compress when the
+    client accepts gzip, or "always" to compress regardless. Compressed
+    responses report the compressed length and serve compressed ranges.
+    """
+
+    reject_head = False
+    fail_range = None
+    gzip = None
+
+    def log_message(self, *args):
+        pass
+
+    def _body(self):
+        accepts = "gzip" in self.headers.get("Accept-Encoding", "")
+        if self.gzip == "always" or (self.gzip == "negotiate" and accepts):
+            return gzip.compress(PAYLOAD, mtime=0), True
+        return PAYLOAD, False
+
+    def _send_headers(self, status, length, encoded):
+        self.send_response(status)
+        self.send_header("Content-Length", str(length))
+        self.send_header("Accept-Ranges", "bytes")
+        if encoded:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+
+    def do_HEAD(self):
+        if self.reject_head:
+            self.send_error(405)
+            return
+        payload, encoded = self._body()
+        self._send_headers(200, len(payload), encoded)
+
+    def do_GET(self):
+        payload, encoded = self._body()
+        byte_range = self.headers.get("Range")
+        if byte_range is None:
+            body, status = payload, 200
+        else:
+            start, end = map(int, byte_range.removeprefix("bytes=").split("-"))
+            if start == self.fail_range:
+                self.send_error(503)
+                return
+            body, status = payload[start:end + 1], 206
+        self._send_headers(status, len(body), encoded)
+        self.wfile.write(body)
+
+@pytest.fixture
+def server(monkeypatch):
+    """Register a fake dataset served over HTTP from a local thread."""
+    handler = type("Handler", (_Handler,), {})
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+
+    url = f"http://127.0.0.1:{httpd.server_port}/data.csv"
+    monkeypatch.setitem(datasets.DATASETS, "fake", {"url": url, "format": "csv"})
+    monkeypatch.setattr(datasets, "RANGE_CHUNK_SIZE", 4096)
+    yield handler
+    httpd.shutdown()
+    httpd.server_close()
+
+def test_read_parquet_copies_are_isolated_from_cache(tmp_path):
+    path = tmp_path / "frame.parquet"
+    pd.DataFrame({"cases": [1, 2, 3], "deaths": [0, 1, 0]}).to_parquet(path)
+
+    df = datasets._read_parquet(path)
+    df.loc[0, "cases"] = -1
+    df["deaths"] *= 0
+
+    fresh = datasets._read_parquet(path)
+    assert fresh["cases"].tolist() == [1, 2, 3]
+    assert fresh["deaths"].tolist() == [0, 1, 0]
+
+def test_download_ranges(server, tmp_path):
+    path = datasets.download_dataset("fake", show_progress=False, cache_dir=tmp_path)
+    assert path.read_bytes() == PAYLOAD
+
+def test_failed_range_leaves_no_file(server, tmp_path):
+    server.fail_range = 8192
+    with pytest.raises(datasets.requests.HTTPError):
+        datasets.download_dataset("fake", show_progress=False, cache_dir=tmp_path)
+    assert list(tmp_path.iterdir()) == []
+
+def test_rejected_head_falls_back_to_stream(server, tmp_path):
+    server.reject_head = True
+    path = datasets.download_dataset("fake", show_progress=False, cache_dir=tmp_path)
+    assert path.read_bytes() == PAYLOAD
+
+@pytest.mark.parametrize("mode", ["negotiate", "always"])
+def test_gzip_server_downloads_decoded_payload(server, tmp_path, mode):
+    server.gzip = mode
+    path = datasets.download_dataset("fake", show_progress=False, cache_dir=tmp_path)
+    assert path.read_bytes() == PAYLOAD
+
+def test_load_dataset_columns_require_processed():
+    with pytest.raises(ValueError, match="processed=True"):
+        datasets.load_dataset("framingham_mini", processed=False, columns=["age"])
+
+def test_load_dataset_columns_forward_force_download(server, tmp_path, monkeypatch):
+    forced = []
+    download = datasets.download_dataset
+
+    def tracking_download(name, force=False, **kwargs):
+        forced.append(force)
+        return download(name, force=force, show_progress=False, cache_dir=tmp_path)
+
+    monkeypatch.setattr(datasets, "download_dataset", tracking_download)
+    monkeypatch.setattr(datasets, "PROCESSED_DIR", tmp_path)
+    monkeypatch.setattr(datasets, "_read_csv", lambda path, info: pd.DataFrame({"x": [1]}))
+
+    df = datasets.load_dataset("fake", force_download=True, columns=["x"])
+    assert df["x"].tolist() == [1]
+    assert forced[0] is True
+
+COVID_CSV = """date,county,state,fips,cases,deaths
+2020-03-02,Washington,Oregon,41067,1,0
+2020-03-01,Washington,Oregon,41067,1,0
+2020-03-01,Washington,Utah,49053,2,0
+2020-03-02,Washington,Utah,49053,5,1
+2020-03-03,Washington,Oregon,41067,4,1
+2020-03-01,Cook,Illinois,,3,
+2020-03-02,Cook,Illinois,,7,2
+"""
+
+@pytest.fixture
+def covid_dirs(tmp_path, monkeypatch):
+    """Point the dataset directories at a small raw COVID counties CSV."""
+    raw, processed = tmp_path / "raw", tmp_path / "processed"
+    raw.mkdir()
+    (raw / "covid_counties.csv").write_text(COVID_CSV)
+    monkeypatch.setattr(datasets, "RAW_DIR", raw)
+    monkeypatch.setattr(datasets, "PROCESSED_DIR", processed)
+    return processed
+
+def test_processed_and_reloaded_dtypes_match(covid_dirs):
+    processed = datasets.process_dataset("covid_counties", force=True)
+    reloaded = datasets.load_dataset("covid_counties")
+
+    pd.testing.assert_series_equal(processed.dtypes, reloaded.dtypes)
+    assert reloaded["state"].cat.categories.tolist() == ["Illinois", "Oregon", "Utah"]
+    pd.testing.assert_frame_equal(processed, reloaded)
+    assert processed.equals(reloaded)
+
+def test_covid_daily_diffs_match_groupby(covid_dirs):
+    df = datasets.process_dataset("covid_counties", force=True)
+
+    grouped = df.astype({"cases": float, "deaths": float}).groupby(
+        ["state", "county"], observed=True
+    )
+    for col, new_col in (("cases", "new_cases"), ("deaths", "new_deaths")):
+        expected = grouped[col].diff()
+        pd.testing.assert_series_equal(
+            df[new_col].astype(float), expected, check_names=False
+        )
+    # Washington appears under two states; each starts its own series
+    first_rows = df.groupby(["state", "county"], observed=True).head(1)
+    assert first_rows["new_cases"].isna().all()
+    assert df.loc[df["state"] == "Utah", "new_cases"].tolist()[1] == 3
@@ -0,0 +1,116 @@
+"""Tests for epirust.pipeline_config."""
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from epirust.pipeline_config import PipelineConfig
+
+def test_transform_is_elementwise_by_default():
+    config = PipelineConfig("survival")
+    config.map_field("group", "arm", transform="lambda x: x[::-1]")
+
+    result = config.transform_data(pd.DataFrame({"arm": ["ab", "cd", "ef"]}))
+
+    assert result["group"].tolist() == ["ba", "dc", "fe"]
+
+def test_vectorized_transform_runs_on_whole_column():
+    config = PipelineConfig("survival")
+    config.map_field(
+        "time", "followup", transform="lambda x: np.log1p(x)", vectorized=True
+    )
+
+    df = pd.DataFrame({"followup": [0.0, 1.0, 3.0]})
+    result = config.transform_data(df)
+
+    np.testing.assert_allclose(result["time"], np.log1p([0.0, 1.0, 3.0]))
+    assert df["followup"].tolist() == [0.0, 1.0, 3.0]
+
+def test_vectorized_transform_must_keep_row_count():
+    config = PipelineConfig("survival")
+    config.map_field("time", "t", transform="lambda x: x[:1]", vectorized=True)
+
+    with pytest.raises(ValueError, match="one value per row"):
+        config.transform_data(pd.DataFrame({"t": [1, 2]}))
+
+def test_vectorized_flag_round_trips_through_config_file(tmp_path):
+    config = PipelineConfig("survival")
+    config.map_field("time", "t", transform="lambda x: x * 2", vectorized=True)
+    config.map_field("event", "e", transform="lambda x: x * 2")
+
+    path = str(tmp_path / "config.yaml")
+    config.save_config(path)
+    loaded = PipelineConfig.load_config(path)
+
+    assert loaded.config.field_mappings["time"].vectorized
+    assert not loaded.config.field_mappings["event"].vectorized
+
+def test_transform_can_use_common_builtins():
+    config = PipelineConfig("survival")
+    config.map_field(
+        "group", "arm", transform="lambda x: x.upper() if isinstance(x, str) else x"
+    )
+    config.map_field("age", "age", transform="lambda x: sorted(range(x))[-1]")
+    config.map_field("time", "t", transform="lambda x: x.sum() + x", vectorized=True)
+
+    result = config.transform_data(
+        pd.DataFrame({"arm": ["a", None], "age": [3, 5], "t": [1, 2]})
+    )
+
+    assert result["group"].tolist() == ["A", None]
+    assert result["age"].tolist() == [2, 4]
+    assert result["time"].tolist() == [4, 5]
+
+@pytest.mark.parametrize(
+    "transform, error",
+    [
+        ("lambda x: open('/dev/null')", NameError),
+        ("lambda x: getattr(x, 'real')", NameError),
+        ("lambda x: __import__('os').getcwd()", ImportError),
+    ],
+)
+def test_transform_namespace_is_restricted(transform, error):
+    config = PipelineConfig("survival")
+    config.map_field("time", "t", transform=transform)
+
+    with pytest.raises(error):
+        config.transform_data(pd.DataFrame({"t": [1]}))
+
+def test_config_with_transform_round_trips_through_pickle():
+    config = PipelineConfig("survival")
+    config.map_field("time", "t", transform="lambda x: x * 2", vectorized=True)
+    config.map_field("event", "e")
+
+    loaded = pickle.loads(pickle.dumps(config))
+
+    assert loaded.config.field_mappings == config.config.field_mappings
+    result = loaded.transform_data(pd.DataFrame({"t": [1, 2], "e": [0, 1]}))
+    assert result["time"].tolist() == [2, 4]
+
+def _suggest(analysis_type, columns):
+    return PipelineConfig(analysis_type).suggest_mappings(pd.DataFrame(columns=columns))
+
+def test_suggestions_rank_variant_hits_first():
+    # "death_flag" contains the variant "death"; "evnt" is only a fuzzy match
+    suggestions = _suggest("survival", ["evnt", "death_flag", "unrelated"])
+
+    assert suggestions["event"] == ["death_flag", "evnt"]
+
+def test_suggestions_include_fuzzy_near_misses():
+    suggestions = _suggest("propensity", ["treated", "outcomes", "subject_age_yrs"])
+
+    assert suggestions["treatment"] == ["treated"]
+    assert suggestions["outcome"] == ["outcomes"]
+
+def test_suggestions_respect_score_cutoff(monkeypatch):
+    assert _suggest("survival", ["grp"])["group"] == ["grp"]
+
+    monkeypatch.setattr(PipelineConfig, "FUZZY_SCORE_CUTOFF", 80)
+    assert _suggest("survival", ["grp"])["group"] == []
+
+def test_suggestion_ties_are_sorted():
+    # Every column scores 100 for "time", by variant or by token set
+    suggestions = _suggest("survival", ["time_b", "period", "Time_A", "duration"])
+
+    assert suggestions["time"] == ["Time_A", "duration", "period", "time_b"]